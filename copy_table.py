@@ -27,10 +27,16 @@ Example:
 
 import argparse
 import boto3
-import time
 import logging
+import os
+import queue
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from botocore.exceptions import ClientError, WaiterError
+from ddb_client import backoff_delay, client_config
 from tqdm import tqdm
 
 # Configure logging
@@ -41,17 +47,43 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Throttling and server error codes; botocore retries these itself, and any that still
+# surface are fed to the AdaptiveLimiter as throttles
+THROTTLE_ERRORS = {
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'InternalServerError',
+    'RequestLimitExceeded',
+}
+
+# Pushed by each scan worker once its segment is exhausted
+SCAN_DONE = object()
+
+# Seconds between status polls of native export/import jobs, which run for minutes to hours
+BULK_POLL_DELAY = 30
+# Give up on a single export or import job after this many seconds
+BULK_TIMEOUT = 12 * 60 * 60
+
+def waiter_config(endpoint_url):
+    """Waiter polling settings: fast polls for DynamoDB Local, slower ones for remote endpoints"""
+    if endpoint_url and (endpoint_url.startswith('http://localhost') or '127.0.0.1' in endpoint_url):
+        return {'Delay': 1, 'MaxAttempts': 30}
+    return {'Delay': 5, 'MaxAttempts': 60}
+
+def table_schema(description):
+    """Extract key schema, attribute definitions and indexes from a describe_table response"""
+    return {
+        'KeySchema': description['Table']['KeySchema'],
+        'AttributeDefinitions': description['Table']['AttributeDefinitions'],
+        'BillingMode': description['Table'].get('BillingMode', 'PAY_PER_REQUEST'),
+        'GlobalSecondaryIndexes': description['Table'].get('GlobalSecondaryIndexes', []),
+        'LocalSecondaryIndexes': description['Table'].get('LocalSecondaryIndexes', [])
+    }
+
 def get_table_schema(client, table_name):
     """Fetch table schema including key schema and attribute definitions"""
     try:
-        response = client.describe_table(TableName=table_name)
-        return {
-            'KeySchema': response['Table']['KeySchema'],
-            'AttributeDefinitions': response['Table']['AttributeDefinitions'],
-            'BillingMode': response['Table'].get('BillingMode', 'PAY_PER_REQUEST'),
-            'GlobalSecondaryIndexes': response['Table'].get('GlobalSecondaryIndexes', []),
-            'LocalSecondaryIndexes': response['Table'].get('LocalSecondaryIndexes', [])
-        }
+        return table_schema(client.describe_table(TableName=table_name))
     except ClientError as e:
         logger.error(f"Error describing table {table_name}: {e.response['Error']['Message']}")
         sys.exit(1)
@@ -71,54 +103,321 @@ def create_destination_table(client, table_name, schema):
         
         # Wait for table to become active
         waiter = client.get_waiter('table_exists')
-        waiter.wait(TableName=table_name, WaiterConfig={'Delay': 1, 'MaxAttempts': 30})
+        waiter.wait(TableName=table_name, WaiterConfig=waiter_config(client.meta.endpoint_url))
         logger.info(f"Table {table_name} created and active")
     except ClientError as e:
         logger.error(f"Error creating table: {e.response['Error']['Message']}")
         sys.exit(1)
 
-def copy_table_data(source_client, dest_client, source_table, dest_table, batch_size=25):
-    """Copy data between tables with batch processing"""
-    source = boto3.resource('dynamodb', client=source_client).Table(source_table)
-    dest = boto3.resource('dynamodb', client=dest_client).Table(dest_table)
-    
-    paginator = source_client.get_paginator('scan')
-    page_iterator = paginator.paginate(
-        TableName=source_table,
-        PaginationConfig={'PageSize': 1000}
-    )
+def native_bulk_eligible(source_client, source_description, bulk_threshold):
+    """Check whether the source table can be copied with a native export and import"""
+    table = source_description['Table']
+    if table['ItemCount'] < bulk_threshold:
+        logger.info(f"Source table has {table['ItemCount']} items (below {bulk_threshold}), using scan copy")
+        return False
+    if table.get('LocalSecondaryIndexes'):
+        logger.info("ImportTable does not support local secondary indexes, using scan copy")
+        return False
+    try:
+        backups = source_client.describe_continuous_backups(TableName=table['TableName'])
+    except ClientError as e:
+        logger.warning(f"Couldn't check point-in-time recovery: {e.response['Error']['Message']}")
+        return False
+    pitr = backups['ContinuousBackupsDescription'].get('PointInTimeRecoveryDescription', {})
+    if pitr.get('PointInTimeRecoveryStatus') != 'ENABLED':
+        logger.info("Point-in-time recovery is not enabled on the source table, using scan copy")
+        return False
+    return True
+
+def wait_for_job(describe, status_key, description):
+    """Poll a native export or import job until it is no longer in progress"""
+    deadline = time.monotonic() + BULK_TIMEOUT
+    while True:
+        job = describe()
+        if job[status_key] not in ('IN_PROGRESS', 'CANCELLING'):
+            return job
+        if time.monotonic() >= deadline:
+            logger.error(f"{description} still in progress after {BULK_TIMEOUT // 3600} hours, giving up")
+            sys.exit(1)
+        logger.info(f"{description} in progress...")
+        time.sleep(BULK_POLL_DELAY)
+
+def native_bulk_copy(source_client, dest_client, source_description, dest_table, schema, staging_bucket):
+    """Copy a table via ExportTableToPointInTime and ImportTable through an S3 staging bucket
+
+    Returns the imported item count and the number of items ImportTable rejected.
+    """
+    source_table = source_description['Table']['TableName']
+    try:
+        logger.info(f"Exporting {source_table} to s3://{staging_bucket}...")
+        export = source_client.export_table_to_point_in_time(
+            TableArn=source_description['Table']['TableArn'],
+            S3Bucket=staging_bucket,
+            S3Prefix=f"dynamodb-data-commander/{source_table}",
+            ExportFormat='DYNAMODB_JSON'
+        )
+        export_arn = export['ExportDescription']['ExportArn']
+        export = wait_for_job(
+            lambda: source_client.describe_export(ExportArn=export_arn)['ExportDescription'],
+            'ExportStatus',
+            "Export"
+        )
+        if export['ExportStatus'] != 'COMPLETED':
+            logger.error(f"Export failed: {export.get('FailureMessage', export['ExportStatus'])}")
+            sys.exit(1)
+
+        # Exported data files live next to the manifest, under <prefix>/AWSDynamoDB/<export id>/data/
+        data_prefix = export['ExportManifest'].rsplit('/', 1)[0] + '/data/'
+        table_parameters = {
+            'TableName': dest_table,
+            'KeySchema': schema['KeySchema'],
+            'AttributeDefinitions': schema['AttributeDefinitions'],
+            'BillingMode': schema['BillingMode']
+        }
+        if schema['GlobalSecondaryIndexes']:
+            table_parameters['GlobalSecondaryIndexes'] = [
+                {'IndexName': index['IndexName'], 'KeySchema': index['KeySchema'], 'Projection': index['Projection']}
+                for index in schema['GlobalSecondaryIndexes']
+            ]
+
+        logger.info(f"Importing s3://{staging_bucket}/{data_prefix} into {dest_table}...")
+        response = dest_client.import_table(
+            S3BucketSource={'S3Bucket': staging_bucket, 'S3KeyPrefix': data_prefix},
+            InputFormat='DYNAMODB_JSON',
+            InputCompressionType='GZIP',
+            TableCreationParameters=table_parameters
+        )
+        import_arn = response['ImportTableDescription']['ImportArn']
+        imported = wait_for_job(
+            lambda: dest_client.describe_import(ImportArn=import_arn)['ImportTableDescription'],
+            'ImportStatus',
+            "Import"
+        )
+        if imported['ImportStatus'] != 'COMPLETED':
+            logger.error(f"Import failed: {imported.get('FailureMessage', imported['ImportStatus'])}")
+            sys.exit(1)
+        return imported.get('ImportedItemCount', 0), imported.get('ErrorCount', 0)
+    except ClientError as e:
+        logger.error(f"Native bulk copy failed: {e.response['Error']['Message']}")
+        sys.exit(1)
+
+class AdaptiveLimiter:
+    """AIMD cap on concurrent BatchWriteItem calls, driven by the recent throttle rate.
+
+    Halves the cap when more than 10% of recent requests were throttled and raises
+    it by one after two consecutive windows below 1%, up to max_concurrency.
+    """
+
+    def __init__(self, max_concurrency, window=100, interval=5.0):
+        self.max_concurrency = max_concurrency
+        self.concurrency = max_concurrency
+        self.interval = interval
+        self.outcomes = deque(maxlen=window)  # True for each throttled request
+        self.calm_windows = 0
+        self.active = 0
+        self.condition = threading.Condition()
+        self.stopped = threading.Event()
+
+    def __enter__(self):
+        with self.condition:
+            self.condition.wait_for(lambda: self.active < self.concurrency)
+            self.active += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify()
+
+    def record(self, throttled):
+        """Record whether a request was throttled"""
+        with self.condition:
+            self.outcomes.append(throttled)
+
+    def adjust(self):
+        """Apply one AIMD step based on the throttle rate of the recent requests"""
+        with self.condition:
+            if not self.outcomes:
+                return
+            throttle_rate = sum(self.outcomes) / len(self.outcomes)
+            if throttle_rate > 0.10:
+                self.concurrency = max(1, self.concurrency // 2)
+                self.calm_windows = 0
+                # Judge the reduced concurrency on fresh requests only
+                self.outcomes.clear()
+                logger.info(f"Throttle rate {throttle_rate:.0%}, write concurrency reduced to {self.concurrency}")
+            elif throttle_rate < 0.01:
+                self.calm_windows += 1
+                if self.calm_windows >= 2 and self.concurrency < self.max_concurrency:
+                    self.concurrency += 1
+                    self.calm_windows = 0
+                    self.condition.notify_all()
+                    logger.debug(f"Write concurrency raised to {self.concurrency}")
+            else:
+                self.calm_windows = 0
+
+    def watch(self):
+        """Adjust the limit every interval until stopped"""
+        while not self.stopped.wait(self.interval):
+            self.adjust()
+
+    def start(self):
+        """Start the background thread that adjusts the limit"""
+        threading.Thread(target=self.watch, daemon=True).start()
+
+    def stop(self):
+        """Stop adjusting the limit"""
+        self.stopped.set()
+
+def write_batch(client, table_name, batch, limiter, max_attempts=10):
+    """Write a batch, retrying UnprocessedItems with backoff; returns (batch, unwritten items)"""
+    remaining = batch
+    for attempt in range(max_attempts):
+        try:
+            with limiter:
+                response = client.batch_write_item(RequestItems={table_name: remaining})
+            remaining = response.get('UnprocessedItems', {}).get(table_name, [])
+            limiter.record(bool(remaining))
+            if not remaining:
+                return batch, remaining
+        except ClientError as e:
+            # Already retried by the client (see ddb_client.client_config)
+            limiter.record(e.response['Error']['Code'] in THROTTLE_ERRORS)
+            logger.error(f"Batch write failed: {e.response['Error']['Message']}")
+            return batch, remaining
+        except Exception as e:
+            # Connection errors and timeouts that botocore gave up on fail this batch, not the copy
+            logger.error(f"Batch write failed: {str(e)}")
+            return batch, remaining
+
+        if attempt + 1 < max_attempts:
+            time.sleep(backoff_delay(attempt))
+
+    return batch, remaining
+
+def scan_segment(client, table_name, segment, total_segments, pages, failed_segments):
+    """Scan one segment of a table and push each page of items onto a shared queue"""
+    try:
+        paginator = client.get_paginator('scan')
+        page_iterator = paginator.paginate(
+            TableName=table_name,
+            Segment=segment,
+            TotalSegments=total_segments,
+            PaginationConfig={'PageSize': 1000}
+        )
+        for page in page_iterator:
+            pages.put(page['Items'])
+    except ClientError as e:
+        logger.error(f"Error scanning segment {segment}: {e.response['Error']['Message']}")
+        failed_segments.append(segment)
+    except Exception as e:
+        logger.error(f"Error scanning segment {segment}: {str(e)}")
+        failed_segments.append(segment)
+    finally:
+        pages.put(SCAN_DONE)
+
+def copy_table_data(source_client, dest_client, source_table, dest_table, batch_size=25,
+                    concurrency=8, scan_segments=4, source_description=None):
+    """Copy data between tables with a parallel segmented scan and parallel batch writes"""
+    batch_size = min(batch_size, 25)
     
-    total_items = 0
     processed_items = 0
+    failed_items = 0
     
-    # Get initial count for progress bar
-    try:
-        count_response = source_client.describe_table(TableName=source_table)
-        total_items = count_response['Table']['ItemCount']
-    except ClientError:
-        logger.warning("Couldn't get item count, progress bar will be indeterminate")
+    # Fetch the item count for the progress bar while the first scan pages load instead of
+    # before them; the response is returned for reuse by validate_copy
+    if source_description is None:
+        metadata_executor = ThreadPoolExecutor(max_workers=1)
+        describe_future = metadata_executor.submit(source_client.describe_table, TableName=source_table)
+        metadata_executor.shutdown(wait=False)
+    else:
+        describe_future = Future()
+        describe_future.set_result(source_description)
     
-    with tqdm(total=total_items, desc="Copying items", unit="item") as pbar:
-        with dest.batch_writer() as batch:
-            for page in page_iterator:
-                for item in page['Items']:
-                    try:
-                        batch.put_item(Item=item)
-                        processed_items += 1
-                        pbar.update(1)
-                    except ClientError as e:
-                        logger.error(f"Error copying item {item.get('id', 'unknown')}: {e.response['Error']['Message']}")
-                    
-                    # Throttling control
-                    if processed_items % 100 == 0:
-                        time.sleep(0.01)
+    # Throttling feedback shrinks the number of concurrent writes below the pool size
+    limiter = AdaptiveLimiter(concurrency)
+    limiter.start()
+
+    try:
+        # The bar is updated once per written batch, from this thread only, with throttled redraws
+        with tqdm(total=None, desc="Copying items", unit="item",
+                  mininterval=0.5, smoothing=0.05) as pbar, \
+                ThreadPoolExecutor(max_workers=concurrency) as executor:
+            in_flight = deque()
+
+            def collect_one():
+                """Wait for the first in-flight batch to finish and record its result"""
+                nonlocal processed_items, failed_items
+                future = next(as_completed(in_flight))
+                in_flight.remove(future)
+                batch, unprocessed = future.result()
+                if unprocessed:
+                    logger.error(f"Failed to write {len(unprocessed)} items")
+                    failed_items += len(unprocessed)
+                written = len(batch) - len(unprocessed)
+                processed_items += written
+                pbar.update(written)
+
+            def resolve_total():
+                """Set the progress bar total from the describe_table response"""
+                nonlocal source_description
+                try:
+                    source_description = describe_future.result()
+                    pbar.total = source_description['Table']['ItemCount']
+                    pbar.refresh()
+                except Exception as e:
+                    # Only the progress bar depends on this call, so no failure may abort the copy
+                    logger.warning(f"Couldn't get item count, progress bar will be indeterminate: {str(e)}")
+
+            # Scan workers feed pages through a bounded queue so reads stay ahead of writes
+            pages = queue.Queue(maxsize=2 * scan_segments)
+            failed_segments = []
+            for segment in range(scan_segments):
+                threading.Thread(
+                    target=scan_segment,
+                    args=(source_client, source_table, segment, scan_segments, pages, failed_segments),
+                    daemon=True
+                ).start()
+
+            finished_segments = 0
+            total_pending = True
+            while finished_segments < scan_segments:
+                items = pages.get()
+                if items is SCAN_DONE:
+                    finished_segments += 1
+                    continue
+                if total_pending and describe_future.done():
+                    resolve_total()
+                    total_pending = False
+                for start in range(0, len(items), batch_size):
+                    batch = [{'PutRequest': {'Item': item}} for item in items[start:start + batch_size]]
+                    # Keep at most `concurrency` batches in flight so memory stays bounded
+                    if len(in_flight) >= concurrency:
+                        collect_one()
+                    in_flight.append(executor.submit(write_batch, dest_client, dest_table, batch, limiter))
+
+            while in_flight:
+                collect_one()
+
+            if total_pending:
+                resolve_total()
+    finally:
+        limiter.stop()
+
+    # A failed segment means part of the source was never read, so the copy is incomplete
+    if failed_segments:
+        logger.error(f"Scan failed for segments {sorted(failed_segments)}; copy is incomplete")
+        sys.exit(1)
     
-    return processed_items
+    return processed_items, failed_items, source_description
 
-def validate_copy(source_client, dest_client, source_table, dest_table):
+def validate_copy(source_client, dest_client, source_table, dest_table, cached_source_desc=None):
     """Compare item counts between source and destination tables"""
     try:
-        source_count = source_client.describe_table(TableName=source_table)['Table']['ItemCount']
+        # ItemCount is only refreshed every ~6 hours, so an earlier describe_table is as good as a new one
+        if cached_source_desc is None:
+            cached_source_desc = source_client.describe_table(TableName=source_table)
+        source_count = cached_source_desc['Table']['ItemCount']
         dest_count = dest_client.describe_table(TableName=dest_table)['Table']['ItemCount']
         
         logger.info(f"Source table items: {source_count}")
@@ -150,6 +449,16 @@ def main():
                         help='Validate item counts after copy')
     parser.add_argument('--batch-size', type=int, default=25, 
                         help='Batch size for writes (default: 25)')
+    parser.add_argument('--concurrency', type=int, default=8, 
+                        help='Number of concurrent batch write requests (default: 8)')
+    parser.add_argument('--scan-segments', type=int, default=4, 
+                        help='Number of parallel scan segments (default: 4)')
+    parser.add_argument('--use-native-bulk', action='store_true', 
+                        help='Copy large tables with a native S3 export and ImportTable when possible')
+    parser.add_argument('--staging-bucket', 
+                        help='S3 bucket for the native export (required with --use-native-bulk)')
+    parser.add_argument('--bulk-threshold', type=int, default=1_000_000, 
+                        help='Minimum source item count for native bulk copy (default: 1000000)')
     parser.add_argument('--delete-source', action='store_true', 
                         help='Delete source table after copy (with confirmation)')
     parser.add_argument('--log-level', default='INFO', 
@@ -158,7 +467,18 @@ def main():
     args = parser.parse_args()
     logger.setLevel(args.log_level)
 
-    # Configure AWS clients
+    if args.batch_size < 1 or args.concurrency < 1 or args.scan_segments < 1:
+        logger.error("Batch size, concurrency and scan segments must be at least 1")
+        sys.exit(1)
+
+    if args.use_native_bulk and not args.staging_bucket:
+        logger.error("--staging-bucket is required with --use-native-bulk")
+        sys.exit(1)
+
+    # Configure AWS clients; the pool must cover every scan and write thread so none of them
+    # queue for a connection
+    pool_size = max(args.scan_segments + args.concurrency, 10)
+    logger.info(f"Connection pool size: {pool_size}")
     source_session = boto3.Session(
         profile_name=args.source_profile,
         region_name=args.source_region
@@ -172,51 +492,104 @@ def main():
         'dynamodb', 
         endpoint_url=args.source_endpoint,
         aws_access_key_id=os.getenv('SOURCE_AWS_ACCESS_KEY_ID', 'dummy'),
-        aws_secret_access_key=os.getenv('SOURCE_AWS_SECRET_ACCESS_KEY', 'dummy')
+        aws_secret_access_key=os.getenv('SOURCE_AWS_SECRET_ACCESS_KEY', 'dummy'),
+        config=client_config(pool_size)
     )
     
     dest_client = dest_session.client(
         'dynamodb', 
         endpoint_url=args.dest_endpoint,
         aws_access_key_id=os.getenv('DEST_AWS_ACCESS_KEY_ID', 'dummy'),
-        aws_secret_access_key=os.getenv('DEST_AWS_SECRET_ACCESS_KEY', 'dummy')
+        aws_secret_access_key=os.getenv('DEST_AWS_SECRET_ACCESS_KEY', 'dummy'),
+        config=client_config(pool_size)
+    )
+
+    # Used only for batch_write_item: scanned items are already valid wire-format attribute
+    # values, so skip botocore's client-side validation pass over every attribute of every item
+    writer_client = dest_session.client(
+        'dynamodb', 
+        endpoint_url=args.dest_endpoint,
+        aws_access_key_id=os.getenv('DEST_AWS_ACCESS_KEY_ID', 'dummy'),
+        aws_secret_access_key=os.getenv('DEST_AWS_SECRET_ACCESS_KEY', 'dummy'),
+        config=client_config(pool_size, parameter_validation=False)
     )
 
     # Check destination table existence
-    dest_tables = dest_client.list_tables().get('TableNames', [])
-    if args.dest_table in dest_tables:
+    dest_exists = args.dest_table in dest_client.list_tables().get('TableNames', [])
+    if dest_exists:
         if args.overwrite_dest:
             logger.warning(f"Deleting existing table {args.dest_table}...")
             dest_client.delete_table(TableName=args.dest_table)
             try:
                 waiter = dest_client.get_waiter('table_not_exists')
-                waiter.wait(TableName=args.dest_table)
+                waiter.wait(TableName=args.dest_table, WaiterConfig=waiter_config(args.dest_endpoint))
             except WaiterError:
                 logger.error("Timed out waiting for table deletion")
                 sys.exit(1)
+            dest_exists = False
         else:
             logger.info(f"Destination table {args.dest_table} already exists")
 
-    # Create destination table if needed
-    if args.dest_table not in dest_client.list_tables().get('TableNames', []):
-        schema = get_table_schema(source_client, args.source_table)
-        create_destination_table(dest_client, args.dest_table, schema)
-
-    # Perform data copy
-    logger.info("Starting data copy...")
-    copied_count = copy_table_data(
-        source_client,
-        dest_client,
-        args.source_table,
-        args.dest_table,
-        args.batch_size
-    )
+    # ImportTable creates the destination table itself, so native bulk copy needs it to be absent
+    use_native_bulk = False
+    source_description = None
+    if args.use_native_bulk:
+        if dest_exists:
+            logger.info("Native bulk copy needs a new destination table, using scan copy")
+        else:
+            try:
+                source_description = source_client.describe_table(TableName=args.source_table)
+                use_native_bulk = native_bulk_eligible(source_client, source_description, args.bulk_threshold)
+            except ClientError as e:
+                logger.warning(f"Couldn't describe source table: {e.response['Error']['Message']}")
+
+    if use_native_bulk:
+        logger.info("Starting native bulk copy...")
+        schema = table_schema(source_description)
+        copied_count, failed_count = native_bulk_copy(
+            source_client,
+            dest_client,
+            source_description,
+            args.dest_table,
+            schema,
+            args.staging_bucket
+        )
+    else:
+        # Create destination table if needed
+        if not dest_exists:
+            schema = get_table_schema(source_client, args.source_table)
+            create_destination_table(dest_client, args.dest_table, schema)
+
+        # Warm up the writer client once so credential resolution, endpoint setup and the
+        # first TLS handshake are done before the write threads start sending batches
+        try:
+            writer_client.describe_table(TableName=args.dest_table)
+        except ClientError as e:
+            logger.warning(f"Couldn't warm up the writer client: {e.response['Error']['Message']}")
+
+        # Perform data copy
+        logger.info("Starting data copy...")
+        copied_count, failed_count, source_description = copy_table_data(
+            source_client,
+            writer_client,
+            args.source_table,
+            args.dest_table,
+            args.batch_size,
+            args.concurrency,
+            args.scan_segments,
+            source_description
+        )
     logger.info(f"Copied {copied_count} items to {args.dest_table}")
+    if failed_count:
+        # Never go on to offer deleting the source when items are missing from the destination
+        logger.error(f"{failed_count} items could not be written to {args.dest_table}")
+        sys.exit(1)
 
     # Validation
     if args.validate:
         logger.info("Validating copy...")
-        if validate_copy(source_client, dest_client, args.source_table, args.dest_table):
+        if validate_copy(source_client, dest_client, args.source_table, args.dest_table,
+                         cached_source_desc=source_description):
             logger.info("Validation successful!")
         else:
             logger.warning("Validation issues detected")
@@ -231,4 +604,4 @@ def main():
             logger.info("Source table preserved")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,25 @@
+"""
+DynamoDB client helpers
+
+Client configuration and retry timing shared by the importer and the table copier.
+"""
+
+import random
+from botocore.config import Config
+
+def client_config(max_pool_connections=10, **overrides):
+    """botocore Config for DynamoDB clients
+
+    Adaptive retry mode retries throttling and server errors itself, with client-side
+    rate limiting, so callers only need their own retries for UnprocessedItems.
+    """
+    return Config(
+        retries={'mode': 'adaptive', 'max_attempts': 10},
+        max_pool_connections=max_pool_connections,
+        tcp_keepalive=True,
+        **overrides
+    )
+
+def backoff_delay(attempt, base=0.05, cap=20.0):
+    """Exponential backoff with jitter for the given retry attempt"""
+    return min(cap, base * 2 ** attempt) * random.uniform(0.5, 1.5)
@@ -0,0 +1,47 @@
+"""
+DynamoDB attribute value conversion
+
+Converts parsed JSON values into DynamoDB attribute values. This is the CPU hot
+path of the importer, so the module is fully type-annotated and can optionally
+be compiled with mypyc:
+
+  pip install mypy
+  mypyc ddb_convert.py
+
+The compiled extension is picked up in place of this file by `import ddb_convert`;
+without it the pure-Python version is used unchanged.
+"""
+
+from typing import Any, Dict
+
+# Top-level keys that mark a dict as already being a DynamoDB attribute value
+DDB_KEYS = frozenset(('S', 'N', 'B', 'BOOL', 'NULL', 'M', 'L', 'SS', 'NS', 'BS'))
+
+def convert_dict(value: Dict[str, object]) -> Dict[str, Any]:
+    """Convert a dict to a DynamoDB map, passing through values already in DynamoDB format"""
+    if not value.keys().isdisjoint(DDB_KEYS):
+        return value
+    return {'M': {k: convert_value(v) for k, v in value.items()}}
+
+def convert_value(value: object) -> Dict[str, Any]:
+    """Recursively convert Python types to DynamoDB attribute types"""
+    # Compiled with mypyc, each isinstance check becomes a C-level type check;
+    # bool must be checked before int since it is an int subclass
+    if isinstance(value, str):
+        return {'S': value}
+    elif isinstance(value, bool):
+        return {'BOOL': value}
+    elif isinstance(value, (int, float)):
+        return {'N': str(value)}
+    elif value is None:
+        return {'NULL': True}
+    elif isinstance(value, list):
+        return {'L': [convert_value(v) for v in value]}
+    elif isinstance(value, dict):
+        return convert_dict(value)
+    else:
+        return {'S': str(value)}
+
+def convert_item(item: Dict[str, object]) -> Dict[str, Any]:
+    """Convert every attribute of a parsed JSON object to DynamoDB format"""
+    return {key: convert_value(value) for key, value in item.items()}
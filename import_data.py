@@ -26,14 +26,20 @@ Example:
 """
 
 import argparse
-import boto3
+import ijson
 import json
+import orjson
 import os
-import glob
+import re
 import sys
+import time
 import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from uuid import uuid4
 from botocore.exceptions import ClientError
+from botocore.session import Session as BotocoreSession
+from ddb_client import backoff_delay, client_config
+from ddb_convert import convert_item
 
 # Configure logging
 logging.basicConfig(
@@ -43,93 +49,157 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def convert_value(value):
-    """Recursively convert Python types to DynamoDB attribute types"""
-    if isinstance(value, str):
-        return {'S': value}
-    elif isinstance(value, bool):
-        return {'BOOL': value}
-    elif isinstance(value, (int, float)):
-        return {'N': str(value)}
-    elif value is None:
-        return {'NULL': True}
-    elif isinstance(value, list):
-        return {'L': [convert_value(v) for v in value]}
-    elif isinstance(value, dict):
-        # Check if already in DynamoDB format
-        if any(key in value for key in ('S', 'N', 'B', 'BOOL', 'NULL', 'M', 'L')):
-            return value
-        return {'M': {k: convert_value(v) for k, v in value.items()}}
-    else:
-        return {'S': str(value)}
+# BatchWriteItem item limit; with DynamoDB's 400 KB item cap a full batch stays well
+# under the 16 MB request limit, so batches are split by count alone
+MAX_BATCH_ITEMS = 25
+
+# DynamoDB client owned by the current process-pool worker (see init_worker)
+worker_client = None
+
+# Read buffer for input files; large buffers cut syscalls on multi-GB imports
+READ_BUFFER_SIZE = 1 << 20
+
+# orjson silently turns integers outside the 64-bit range into floats; such integers
+# need at least 19 digits, so lines containing one are parsed exactly with json instead
+LONG_DIGIT_RUN = re.compile(rb'\d{19}')
+
+def read_records(f):
+    """Yield (position, record) pairs from an NDJSON file or a single top-level JSON array.
+
+    NDJSON lines are yielded as raw bytes for the caller to parse, while array
+    elements are streamed with ijson and yielded already parsed.
+    """
+    if f.peek(READ_BUFFER_SIZE).lstrip()[:1] == b'[':
+        yield from enumerate(ijson.items(f, 'item', use_float=True), 1)
+        return
+
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if line:
+            yield line_number, line
+
+def parse_record(line):
+    """Parse one NDJSON line, keeping integers beyond 64 bits exact"""
+    if LONG_DIGIT_RUN.search(line):
+        return json.loads(line)
+    return orjson.loads(line)
+
+def flush_batch(client, table_name, batch, file_path):
+    """Write a batch from a file, counting all of its items as errors if the write raises"""
+    try:
+        return write_batch(client, table_name, batch)
+    except Exception as e:
+        logger.error(f"Batch write failed in {file_path} - {str(e)}")
+        return 0, len(batch)
 
 def process_file(file_path, table_name, client, batch_size=25):
     """Process a single JSON file and import its contents"""
-    with open(file_path, 'r') as f:
-        batch = []
+    with open(file_path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+        # Fixed-size batch buffer, filled by index and reused for every batch
+        batch = [None] * batch_size
+        batch_len = 0
         item_count = 0
         batch_count = 0
         error_count = 0
+        line_number = 0
 
-        for line_number, line in enumerate(f, 1):
-            line = line.strip()
-            if not line:
-                continue
+        try:
+            for line_number, record in read_records(f):
+                try:
+                    item = parse_record(record) if isinstance(record, bytes) else record
+                    item_count += 1
 
-            try:
-                item = json.loads(line)
-                item_count += 1
-
-                # Convert to DynamoDB format
-                converted_item = {}
-                for key, value in item.items():
-                    converted_item[key] = convert_value(value)
-
-                # Ensure ID exists
-                if 'id' not in converted_item or not converted_item.get('id'):
-                    converted_item['id'] = {'S': str(uuid4())}
-
-                batch.append({'PutRequest': {'Item': converted_item}})
-
-                # Process batch when full
-                if len(batch) >= batch_size:
-                    processed, errors = write_batch(client, table_name, batch)
-                    batch_count += processed
-                    error_count += errors
-                    batch = []
-
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON error in {file_path}:{line_number} - {str(e)}")
-                error_count += 1
-            except Exception as e:
-                logger.error(f"Unexpected error in {file_path}:{line_number} - {str(e)}")
-                error_count += 1
+                    # Convert to DynamoDB format
+                    converted_item = convert_item(item)
+
+                    # Ensure ID exists
+                    if 'id' not in converted_item or not converted_item.get('id'):
+                        converted_item['id'] = {'S': str(uuid4())}
+
+                    batch[batch_len] = {'PutRequest': {'Item': converted_item}}
+                    batch_len += 1
+
+                    # Process batch when full
+                    if batch_len == batch_size:
+                        processed, errors = flush_batch(client, table_name, batch, file_path)
+                        batch_count += processed
+                        error_count += errors
+                        batch_len = 0
+
+                except json.JSONDecodeError as e:  # also raised by orjson, which subclasses it
+                    logger.error(f"JSON error in {file_path}:{line_number} - {str(e)}")
+                    error_count += 1
+                except Exception as e:
+                    logger.error(f"Unexpected error in {file_path}:{line_number} - {str(e)}")
+                    error_count += 1
+        except ijson.JSONError as e:
+            # A malformed JSON array cannot be resumed, so the rest of the file is skipped
+            logger.error(f"JSON error in {file_path} after item {line_number} - {str(e)}")
+            error_count += 1
 
         # Process final batch
-        if batch:
-            processed, errors = write_batch(client, table_name, batch)
+        if batch_len:
+            processed, errors = flush_batch(client, table_name, batch[:batch_len], file_path)
             batch_count += processed
             error_count += errors
 
     return item_count, batch_count, error_count
 
-def write_batch(client, table_name, batch):
-    """Write a batch of items and handle unprocessed items"""
-    try:
-        response = client.batch_write_item(RequestItems={table_name: batch})
-        unprocessed = response.get('UnprocessedItems', {}).get(table_name, [])
-        
-        if unprocessed:
-            logger.warning(f"Unprocessed items: {len(unprocessed)}")
-            # Retry logic could be added here
-        
-        return 1, len(unprocessed)  # (batches processed, errors)
-    except ClientError as e:
-        logger.error(f"AWS Client Error: {e.response['Error']['Message']}")
-        return 0, len(batch)
-    except Exception as e:
-        logger.error(f"Batch write failed: {str(e)}")
-        return 0, len(batch)
+def write_batch(client, table_name, batch, max_attempts=10):
+    """Write any number of items as BatchWriteItem calls, returning (batches processed, errors)"""
+    batch_count = 0
+    error_count = 0
+    for start in range(0, len(batch), MAX_BATCH_ITEMS):
+        processed, errors = write_sub_batch(client, table_name, batch[start:start + MAX_BATCH_ITEMS], max_attempts)
+        batch_count += processed
+        error_count += errors
+    return batch_count, error_count
+
+def write_sub_batch(client, table_name, batch, max_attempts=10):
+    """Write a batch of items, retrying UnprocessedItems with exponential backoff"""
+    remaining = batch
+    for attempt in range(max_attempts):
+        try:
+            response = client.batch_write_item(RequestItems={table_name: remaining})
+            remaining = response.get('UnprocessedItems', {}).get(table_name, [])
+            if not remaining:
+                return 1, 0  # (batches processed, errors)
+            logger.debug(f"Unprocessed items: {len(remaining)}, retrying")
+        except ClientError as e:
+            # Already retried by the client (see ddb_client.client_config)
+            logger.error(f"AWS Client Error: {e.response['Error']['Message']}")
+            return 0, len(remaining)
+        except Exception as e:
+            logger.error(f"Batch write failed: {str(e)}")
+            return 0, len(remaining)
+
+        if attempt + 1 < max_attempts:
+            time.sleep(backoff_delay(attempt))
+
+    logger.warning(f"Unprocessed items after {max_attempts} attempts: {len(remaining)}")
+    return 0, len(remaining)
+
+def create_client(endpoint_url, region, max_pool_connections=10):
+    """Build a DynamoDB client using credentials from the environment"""
+    # A plain botocore session avoids importing boto3's resource layer, which the importer never uses
+    return BotocoreSession().create_client(
+        'dynamodb',
+        endpoint_url=endpoint_url,
+        region_name=region,
+        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'dummy'),
+        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'dummy'),
+        config=client_config(max_pool_connections)
+    )
+
+def init_worker(endpoint_url, region, log_level):
+    """Set up a process-pool worker with its own client, since clients are not fork-safe"""
+    global worker_client
+    logger.setLevel(log_level)
+    worker_client = create_client(endpoint_url, region)
+
+def import_file(file_path, table_name, batch_size, client=None):
+    """Pool task: process one file with the given client or the worker's own client"""
+    return process_file(file_path, table_name, client or worker_client, batch_size)
 
 def main():
     parser = argparse.ArgumentParser(description='DynamoDB JSON Data Importer')
@@ -139,7 +209,13 @@ def main():
                         help='DynamoDB endpoint URL (default: http://localhost:8000)')
     parser.add_argument('--region', default='us-west-2', help='AWS region (default: us-west-2)')
     parser.add_argument('--batch-size', type=int, default=25, 
-                        help='Batch size for writes (1-25, default: 25)')
+                        help='Items per write batch; larger batches are split into '
+                             '25-item requests (default: 25)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, 
+                        help='Number of files processed in parallel (default: CPU count)')
+    parser.add_argument('--workers-mode', default='process', choices=['process', 'thread'], 
+                        help='Run workers as processes (CPU-bound) or threads sharing one client '
+                             '(IO-bound remote endpoints) (default: process)')
     parser.add_argument('--log-level', default='INFO', 
                         choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], help='Logging level')
     
@@ -147,21 +223,17 @@ def main():
     logger.setLevel(args.log_level)
     
     # Validate batch size
-    if not 1 <= args.batch_size <= 25:
-        logger.error("Batch size must be between 1 and 25")
+    if args.batch_size < 1:
+        logger.error("Batch size must be at least 1")
+        sys.exit(1)
+
+    if args.workers < 1:
+        logger.error("Workers must be at least 1")
         sys.exit(1)
 
-    # Configure AWS credentials
-    session = boto3.Session(
-        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'dummy'),
-        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'dummy'),
-        region_name=args.region
-    )
-    
-    client = session.client('dynamodb', endpoint_url=args.endpoint_url)
-    
     # Find JSON files
-    files = glob.glob(os.path.join(args.data_dir, '*.json'))
+    files = [entry.path for entry in os.scandir(args.data_dir)
+             if entry.name.endswith('.json') and entry.is_file()]
     if not files:
         logger.warning(f"No JSON files found in {args.data_dir}")
         return
@@ -171,19 +243,38 @@ def main():
     total_items = 0
     total_errors = 0
     
-    for i, file_path in enumerate(files, 1):
-        logger.info(f"Processing file {i}/{len(files)}: {os.path.basename(file_path)}")
-        item_count, batch_count, error_count = process_file(
-            file_path,
-            args.table_name,
-            client,
-            args.batch_size
+    if args.workers_mode == 'process':
+        # Each worker process builds its own client in init_worker
+        client = None
+        executor = ProcessPoolExecutor(
+            max_workers=args.workers,
+            initializer=init_worker,
+            initargs=(args.endpoint_url, args.region, args.log_level)
         )
-        
-        total_items += item_count
-        total_errors += error_count
-        
-        logger.info(f"  Items: {item_count} | Batches: {batch_count} | Errors: {error_count}")
+    else:
+        # Clients are thread-safe, so threads share a single one sized for all of them
+        client = create_client(args.endpoint_url, args.region, args.workers * 2)
+        executor = ThreadPoolExecutor(max_workers=args.workers)
+
+    with executor:
+        futures = {
+            executor.submit(import_file, file_path, args.table_name, args.batch_size, client): file_path
+            for file_path in files
+        }
+        for i, future in enumerate(as_completed(futures), 1):
+            file_name = os.path.basename(futures[future])
+            try:
+                item_count, batch_count, error_count = future.result()
+            except Exception as e:
+                logger.error(f"Failed to process {file_name}: {str(e)}")
+                total_errors += 1
+                continue
+            
+            total_items += item_count
+            total_errors += error_count
+            
+            logger.info(f"Processed file {i}/{len(files)}: {file_name} | "
+                        f"Items: {item_count} | Batches: {batch_count} | Errors: {error_count}")
     
     logger.info(f"Import completed! Total items: {total_items} | Total errors: {total_errors}")
     if total_errors: